@@ -1,37 +1,82 @@
 from fastapi import FastAPI
 from fastapi.responses import StreamingResponse, HTMLResponse
-from picamera2 import Picamera2
+from picamera2 import Picamera2, MappedArray
 from PIL import Image, ImageDraw, ImageFont
-import io, asyncio, logging
+import numpy as np
+import io, asyncio, logging, os, queue, threading
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import time
 
+# Prefer simplejpeg (libjpeg-turbo, NEON-accelerated on the Pi) for the
+# per-frame JPEG encode; fall back to PIL's encoder if it isn't installed.
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# Optional: numba turns the overlay blend into native code. Purely a
+# nice-to-have; the numpy fallback below does the same thing.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Logging configuration
 logging.basicConfig(
     level=logging.INFO,
     format='[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
 )
 
-# Configuration parameters
-IMAGE_SIZE_X = 640
-IMAGE_SIZE_Y = 480
-SLEEP_TIME_SECONDS = 0.04  # reduces CPU load (~ 25 FPS)
-TIMEZONE = 'Europe/Berlin'
+# Configuration parameters, overridable via environment variables so the
+# same module serves all deployments without editing the file.
+IMAGE_SIZE_X = int(os.environ.get('IMAGE_SIZE_X', 640))
+IMAGE_SIZE_Y = int(os.environ.get('IMAGE_SIZE_Y', 480))
+SLEEP_TIME_SECONDS = float(os.environ.get('SLEEP_TIME_SECONDS', 0.04))  # reduces CPU load (~ 25 FPS)
+TIMEZONE = os.environ.get('TIMEZONE', 'Europe/Berlin')
+TZ = ZoneInfo(TIMEZONE)  # construct once; ZoneInfo lookup is not free
+SPINNER_ENABLED = os.environ.get('SPINNER_ENABLED', '1') == '1'
+JPEG_QUALITY = int(os.environ.get('JPEG_QUALITY', 90))
+# Offload MJPEG encoding to the Pi's hardware encoder (V4L2 M2M); the
+# per-frame software encode path is bypassed entirely.
+USE_HW_ENCODER = os.environ.get('USE_HW_ENCODER', '0') == '1'
+MJPEG_BITRATE = int(os.environ.get('MJPEG_BITRATE', 2_000_000))
+# Freeze exposure/white balance after warmup; saves the ISP per-frame 3A
+# work, but only sensible for scenes with stable lighting, so opt-in.
+LOCK_CAMERA_CONTROLS = os.environ.get('LOCK_CAMERA_CONTROLS', '0') == '1'
 
 app = FastAPI()
 
 # Globals for camera data
+# Single-producer/many-consumer slot: the latest framed JPEG (an
+# immutable bytes object shared by all clients) is published by one
+# reference assignment, and each client just gets its event set. No
+# queues, no per-client put/get bookkeeping.
 latest_frame = None
-frame_lock = asyncio.Lock()
-stop_event = asyncio.Event()
+subscribers = set()  # one asyncio.Event per connected client
+stop_event = threading.Event()
 
-# We'll create the task **lazily** (on first request) so that
-# it happens inside the actual Gunicorn worker context.
-frame_task = None
+# Set while at least one client is streaming; the capture worker idles
+# (and the encoder starves) when nobody is watching, so an idle Pi
+# spends no CPU on frames streamed into the void.
+clients_connected = threading.Event()
+active_clients = 0
 
-# Buffer for JPEG conversion
-jpeg_buffer = io.BytesIO()
+# Size-1 handoff between the capture and the encode thread; stale frames
+# are dropped so the encoder always sees the freshest capture.
+capture_q = queue.Queue(maxsize=1)
+
+# Row stride of the main stream, set once the camera is configured; the
+# encoder uses it to carve plane views out of the raw capture buffer.
+frame_stride = None
+
+# We'll start the worker threads **lazily** (on startup of the worker)
+# so that it happens inside the actual Gunicorn worker context.
+worker_threads = []
+main_loop = None
+
+# Camera handle when the hardware MJPEG encoder is in use
+hw_camera = None
 
 # Load the font (ensure the font path is correct)
 font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
@@ -42,42 +87,188 @@ except IOError:
     logging.warning(f"Font {font_path} not found. Using default font.")
     font = ImageFont.load_default()
 
+# Whether simplejpeg can encode planar YUV directly. Debian bullseye
+# ships simplejpeg 1.6.x, which predates encode_jpeg_yuv_planes but does
+# have encode_jpeg: still libjpeg-turbo, just fed interleaved RGB, so
+# only the direct-YUV fast path (and the YUV420 camera format that goes
+# with it) is given up. PIL is only for simplejpeg missing entirely.
+SIMPLEJPEG_YUV = simplejpeg is not None and hasattr(simplejpeg, 'encode_jpeg_yuv_planes')
+if simplejpeg is None:
+    logging.warning("simplejpeg not available, falling back to the slower PIL JPEG encoder.")
+elif not SIMPLEJPEG_YUV:
+    logging.warning("simplejpeg has no encode_jpeg_yuv_planes, "
+                    "encoding RGB frames via encode_jpeg instead.")
+
+# Pre-render the timestamp glyphs once at startup; per frame they are just
+# blitted into the frame with numpy instead of re-running FreeType.
+# All digits share the width of the widest one so any time string
+# occupies exactly the same area.
+if hasattr(font, 'getmetrics'):
+    # FreeType font: full line height plus per-character advances
+    _ascent, _descent = font.getmetrics()
+    GLYPH_H = _ascent + _descent
+
+    def _char_width(ch):
+        return font.getbbox(ch)[2]
+else:
+    # Bitmap fallback font: load_default() on the Pillow shipped with
+    # bullseye has neither getmetrics nor getbbox, but getmask works on
+    # every font type, so measure the rendered masks instead.
+    GLYPH_H = max(font.getmask(_c).size[1] for _c in "0123456789:")
+
+    def _char_width(ch):
+        return font.getmask(ch).size[0] + 1  # +1 px spacing between glyphs
+
+_digit_w = max(_char_width(_c) for _c in "0123456789")
+GLYPHS = {}
+for _ch in "0123456789:":
+    _w = _digit_w if _ch != ':' else _char_width(':')
+    _tile = Image.new('L', (_w, GLYPH_H), 0)
+    ImageDraw.Draw(_tile).text((0, 0), _ch, font=font, fill=255)
+    GLYPHS[_ch] = np.asarray(_tile)
+TEXT_W = sum(GLYPHS[_ch].shape[1] for _ch in "00:00:00")
+TEXT_H = GLYPH_H
+
+def overlay_callback(request):
+    """picamera2 pre_callback: draw the overlay into the ISP buffer in place.
+
+    The frame is then touched exactly once end to end (ISP writes it, the
+    overlay edits it in place, the encoder reads it) instead of being
+    read and written again by a separate overlay pass.
+    """
+    if not clients_connected.is_set():
+        return
+    with MappedArray(request, "main") as m:
+        if SIMPLEJPEG_YUV:
+            # YUV420: the first IMAGE_SIZE_Y rows are the luma plane
+            draw_timestamp(m.array[:IMAGE_SIZE_Y, :IMAGE_SIZE_X])
+        else:
+            draw_timestamp(m.array)
+
+def lock_camera_controls(picam):
+    """Freeze exposure and white balance once AE/AWB have converged."""
+    time.sleep(1.0)  # give the algorithms time to settle
+    metadata = picam.capture_metadata()
+    picam.set_controls({
+        "AeEnable": False,
+        "AwbEnable": False,
+        "ExposureTime": metadata["ExposureTime"],
+        "AnalogueGain": metadata["AnalogueGain"],
+        "ColourGains": metadata["ColourGains"],
+    })
+    logging.info("Camera exposure and white balance locked")
+
 def initialize_camera():
     """Initialize and start the camera."""
     picam = Picamera2()
-    config = picam.create_still_configuration(main={"size": (IMAGE_SIZE_X, IMAGE_SIZE_Y)})
+    if SIMPLEJPEG_YUV:
+        # YUV420 halves the bytes per frame vs RGB and lets libjpeg-turbo
+        # skip the RGB->YCbCr conversion: the ISP already delivers what
+        # the JPEG encoder wants.
+        config = picam.create_video_configuration(
+            main={"size": (IMAGE_SIZE_X, IMAGE_SIZE_Y), "format": "YUV420"},
+            buffer_count=3
+        )
+    else:
+        # Note the libcamera naming: BGR888 is R,G,B in memory, which is
+        # the order both encode_jpeg(colorspace='RGB') and the PIL 'RGB'
+        # wrap in the encode worker expect.
+        config = picam.create_video_configuration(
+            main={"size": (IMAGE_SIZE_X, IMAGE_SIZE_Y), "format": "BGR888"}
+        )
     picam.configure(config)
+    global frame_stride
+    frame_stride = picam.camera_configuration()["main"]["stride"]
+    # Fuse the timestamp overlay into the ISP buffer before the frame is
+    # handed out, so the encoder receives already-overlaid frames.
+    picam.pre_callback = overlay_callback
     picam.start()
+    if LOCK_CAMERA_CONTROLS:
+        lock_camera_controls(picam)
     return picam
 
-async def frame_updater():
-    """Async task that continuously grabs frames and stores the latest JPEG."""
-    global latest_frame
+class StreamingOutput(io.BufferedIOBase):
+    """Sink for the hardware MJPEG encoder: publishes each frame to clients.
+
+    write() is called on picamera2's encoder thread with one complete
+    JPEG per frame; the GIL is never taken for the encode itself.
+    """
+    def writable(self):
+        return True
+
+    def write(self, buf):
+        if clients_connected.is_set():
+            main_loop.call_soon_threadsafe(publish_frame, bytes(buf))
+        return len(buf)
+
+def start_hw_encoder_once():
+    """Start the camera with the hardware MJPEG encoder if not already running."""
+    global hw_camera
+    if hw_camera is not None:
+        return
+    # Imported here so the software path doesn't pay for encoder setup
+    from picamera2.encoders import MJPEGEncoder
+    from picamera2.outputs import FileOutput
+    hw_camera = initialize_camera()
+    hw_camera.start_encoder(MJPEGEncoder(bitrate=MJPEG_BITRATE), FileOutput(StreamingOutput()))
+    logging.info("Hardware MJPEG encoder started")
+
+def put_latest(q, item):
+    """Put into a size-1 queue, dropping the stale item if necessary."""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put(item)
+
+def capture_worker():
+    """Thread that continuously grabs frames and hands them to the encoder.
+
+    Runs the DMA-bound capture independently of the CPU-bound encode so
+    the camera isn't idle while a frame is being compressed.
+    """
     picam = None
 
-    while not stop_event.is_set():
+    # Bind hot-loop names to locals once (LOAD_FAST beats LOAD_GLOBAL at
+    # 25 iterations per second)
+    monotonic = time.monotonic
+    sleep = time.sleep
+    sleep_time = SLEEP_TIME_SECONDS
+    stopped = stop_event.is_set
+    next_tick = monotonic()
+
+    while not stopped():
         try:
+            # Idle while no client is connected; resumes within one frame
+            # time on the first connection since the camera stays up.
+            if not clients_connected.wait(timeout=0.5):
+                next_tick = monotonic()
+                continue
+
             if picam is None:
                 picam = initialize_camera()
                 logging.info("Camera initialized")
 
-            # Capture the current frame
-            frame = picam.capture_array()
-            img = Image.fromarray(frame)
-
-            # Draw timestamp
-            draw_timestamp(img)
-
-            # Convert to JPEG (re-use the buffer)
-            jpeg_buffer.seek(0)
-            img.save(jpeg_buffer, format='JPEG', quality=90, optimize=True)
-            jpeg_buffer.truncate()
-            jpeg = jpeg_buffer.getvalue()
+            # Capture the current frame and pass it on, dropping a stale
+            # one if the encoder hasn't kept up. capture_buffer skips the
+            # reshape/trim pass that capture_array performs on every
+            # frame; the encoder carves plane views out of the raw buffer.
+            if SIMPLEJPEG_YUV:
+                frame = picam.capture_buffer("main")
+            else:
+                frame = picam.capture_array()
+            put_latest(capture_q, frame)
 
-            async with frame_lock:
-                latest_frame = jpeg
-
-            await asyncio.sleep(SLEEP_TIME_SECONDS)
+            # Pace against a monotonic deadline so variable capture time
+            # doesn't make the effective FPS drift below target.
+            next_tick += sleep_time
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                # Fell behind (e.g. a slow capture); resync instead of
+                # trying to catch up with a burst.
+                next_tick = monotonic()
 
         except Exception as e:
             logging.error(f"Camera error: {e}")
@@ -93,9 +284,9 @@ async def frame_updater():
                     logging.warning(f"Error closing camera: {close_exc}")
                 picam = None
             logging.info("Reinitializing camera in 2 seconds...")
-            await asyncio.sleep(2)
+            time.sleep(2)
 
-    # Release resources when stopping the task
+    # Release resources when stopping the thread
     if picam:
         try:
             picam.stop()
@@ -106,7 +297,96 @@ async def frame_updater():
         except Exception:
             pass
 
-def draw_spinner(draw, center_x, center_y, radius, angle, color=(255, 255, 255)):
+def encode_worker():
+    """Thread that overlays the timestamp and JPEG-encodes captured frames."""
+    # Reusable buffer for the PIL fallback encoder; simplejpeg returns
+    # the encoded bytes directly, sized to the payload.
+    jpeg_buffer = io.BytesIO() if simplejpeg is None else None
+
+    # Bind hot-loop names to locals once
+    stopped = stop_event.is_set
+    get_frame = capture_q.get
+    width, height = IMAGE_SIZE_X, IMAGE_SIZE_Y
+
+    while not stopped():
+        try:
+            frame = get_frame(timeout=0.5)
+        except queue.Empty:
+            continue
+
+        try:
+            if SIMPLEJPEG_YUV:
+                # Planar YUV420 raw buffer: Y plane of `height` rows of
+                # `stride` bytes, followed by the U and V planes at half
+                # resolution with half the stride. The views below don't
+                # copy anything; padding columns are sliced away.
+                stride = frame_stride
+                half_stride = stride // 2
+                y_end = stride * height
+                u_end = y_end + half_stride * (height // 2)
+                y_plane = frame[:y_end].reshape(height, stride)[:, :width]
+                u_plane = frame[y_end:u_end] \
+                    .reshape(height // 2, half_stride)[:, :width // 2]
+                v_plane = frame[u_end:u_end + half_stride * (height // 2)] \
+                    .reshape(height // 2, half_stride)[:, :width // 2]
+
+                # Encode the planes directly via libjpeg-turbo; no
+                # colorspace conversion needed.
+                # ascontiguousarray is a no-op unless the stride carries
+                # padding columns that had to be sliced away.
+                jpeg = simplejpeg.encode_jpeg_yuv_planes(
+                    np.ascontiguousarray(y_plane),
+                    np.ascontiguousarray(u_plane),
+                    np.ascontiguousarray(v_plane),
+                    quality=JPEG_QUALITY,
+                    fastdct=True
+                )
+            elif simplejpeg is not None:
+                # Old simplejpeg (no planar API): still libjpeg-turbo,
+                # fed the interleaved frame instead. The camera's BGR888
+                # buffer is R,G,B in memory, i.e. RGB to simplejpeg.
+                jpeg = simplejpeg.encode_jpeg(
+                    np.ascontiguousarray(frame),
+                    quality=JPEG_QUALITY,
+                    colorspace='RGB',
+                    colorsubsampling='420',
+                    fastdct=True
+                )
+            else:
+                # Wrap the ndarray for PIL encoding. Note Pillow still
+                # copies for the 'RGB' raw mode (zero-copy frombuffer
+                # only exists for 'L'/'RGBX'/'RGBA'/'CMYK').
+                frame = np.ascontiguousarray(frame)
+                img = Image.frombuffer('RGB', (width, height), frame, 'raw', 'RGB', 0, 1)
+
+                # Convert to JPEG with PIL (re-use the buffer).
+                # No optimize pass (it doubles encode time for a few
+                # percent size win) and 4:2:0 chroma subsampling, matching
+                # the simplejpeg path.
+                jpeg_buffer.seek(0)
+                img.save(jpeg_buffer, format='JPEG', quality=JPEG_QUALITY, subsampling=2)
+                jpeg_buffer.truncate()
+                jpeg = jpeg_buffer.getvalue()
+
+            # Hand the finished frame over to the event loop
+            main_loop.call_soon_threadsafe(publish_frame, jpeg)
+
+        except Exception as e:
+            logging.error(f"Encode error: {e}")
+
+def publish_frame(jpeg):
+    """Runs on the event loop: frame the JPEG once and wake all clients."""
+    global latest_frame
+    # Assemble the complete multipart chunk once per frame; every client
+    # then yields the same immutable bytes object as a single write
+    # instead of three separate sends (or per-client concatenation).
+    # Overwriting the slot is the drop-oldest policy: a slow client
+    # always picks up the freshest frame.
+    latest_frame = b''.join((FRAME_HEADER % len(jpeg), jpeg, FRAME_TRAILER))
+    for event in subscribers:
+        event.set()
+
+def draw_spinner(draw, center_x, center_y, radius, angle, color=255):
     """Draws a spinner at the specified location."""
     start_angle = angle
     end_angle = angle + 270  # Spinner arc length
@@ -118,47 +398,118 @@ def draw_spinner(draw, center_x, center_y, radius, angle, color=(255, 255, 255))
         width=3
     )
 
-def draw_timestamp(img):
-    """Draws a timestamp and spinner in the bottom-right corner of the image."""
-    draw = ImageDraw.Draw(img)
-    timezone = ZoneInfo(TIMEZONE)
-    timestamp = datetime.now(timezone).strftime("%H:%M:%S")
-    text_width, text_height = draw.textsize(timestamp, font=font)
+def render_arc_tile(radius, angle):
+    """Render the spinner arc into a small grayscale tile."""
+    size = 2 * radius + 4
+    tile = Image.new('L', (size, size), 0)
+    draw_spinner(ImageDraw.Draw(tile), size // 2, size // 2, radius, angle)
+    return np.asarray(tile)
+
+# Precompute one spinner tile per integer angle so the hot path only has
+# to blit the right tile instead of rasterizing an arc every frame.
+SPINNER_RADIUS = int(TEXT_H * 1.5)  # 3 times larger than original
+SPINNER_TILES = [render_arc_tile(SPINNER_RADIUS, a) for a in range(360)] if SPINNER_ENABLED else []
 
+def _max_blend(region, tile):
+    """Lighten (max) blend of a grayscale tile into a 2D region, in place."""
+    np.maximum(region, tile, out=region)
+
+if njit is not None:
+    # JIT-compiled on first use (i.e. at worker warmup); afterwards the
+    # inner loop runs as native code and auto-vectorizes on ARM.
+    @njit(cache=True)
+    def _max_blend(region, tile):  # noqa: F811
+        h, w = tile.shape
+        for i in range(h):
+            for j in range(w):
+                if tile[i, j] > region[i, j]:
+                    region[i, j] = tile[i, j]
+
+def blit_max(frame, tile, top, left):
+    """Blend a grayscale tile into the frame with a lighten (max) blend.
+
+    Works on the luma plane (2D) as well as on RGB frames (3D).
+    """
+    region = frame[top:top + tile.shape[0], left:left + tile.shape[1]]
+    if region.ndim == 3:
+        np.maximum(region, tile[:, :, None], out=region)
+    else:
+        _max_blend(region, tile)
+
+# The timestamp only changes once per second, so the whole glyph strip
+# is composed once per second into a reusable tile; per frame it is a
+# single blit instead of one per character.
+_last_sec = -1
+_timestamp_strip = np.zeros((TEXT_H, TEXT_W), dtype=np.uint8)
+
+def timestamp_strip():
+    """Return the glyph strip for the current time, recomposed only on a new second."""
+    global _last_sec
+    sec = int(time.time())
+    if sec != _last_sec:
+        text = datetime.fromtimestamp(sec, TZ).strftime("%H:%M:%S")
+        x = 0
+        for ch in text:
+            glyph = GLYPHS[ch]
+            _timestamp_strip[:, x:x + glyph.shape[1]] = glyph
+            x += glyph.shape[1]
+        _last_sec = sec
+    return _timestamp_strip
+
+def draw_timestamp(frame):
+    """Draws a timestamp and spinner in the bottom-right corner of the frame.
+
+    Operates directly on the numpy array (luma plane or RGB frame); the
+    glyphs were rasterized once at startup, so per frame this is only a
+    handful of small slice operations.
+    """
     # Position: bottom right with some padding
     padding = 10
-    x = IMAGE_SIZE_X - text_width - padding
-    y = IMAGE_SIZE_Y - text_height - padding
+    x = IMAGE_SIZE_X - TEXT_W - padding
+    y = IMAGE_SIZE_Y - TEXT_H - padding
 
     # Draw spinner above the timestamp
-    spinner_radius = int(text_height * 1.5)  # 3 times larger than original
-    spinner_center_x = x + text_width // 2
-    spinner_center_y = y - spinner_radius - padding
-    current_time = time.time()
-    spinner_angle = (current_time * 360) % 360
-    draw_spinner(draw, spinner_center_x, spinner_center_y, spinner_radius, spinner_angle)
-
-    # Optional: semi-transparent rectangle
+    if SPINNER_ENABLED:
+        spinner_center_x = x + TEXT_W // 2
+        spinner_center_y = y - SPINNER_RADIUS - padding
+        current_time = time.time()
+        spinner_angle = (current_time * 360) % 360
+        tile = SPINNER_TILES[int(spinner_angle) % 360]
+        blit_max(frame, tile, spinner_center_y - tile.shape[0] // 2, spinner_center_x - tile.shape[1] // 2)
+
+    # Darken the box behind the text (replaces the semi-transparent rectangle)
     rectangle_padding = 5
-    rectangle_x0 = x - rectangle_padding
-    rectangle_y0 = y - rectangle_padding
-    rectangle_x1 = x + text_width + rectangle_padding
-    rectangle_y1 = y + text_height + rectangle_padding
-    draw.rectangle(
-        [rectangle_x0, rectangle_y0, rectangle_x1, rectangle_y1],
-        fill=(0, 0, 0, 128)
-    )
+    box = frame[y - rectangle_padding:y + TEXT_H + rectangle_padding,
+                x - rectangle_padding:x + TEXT_W + rectangle_padding]
+    box >>= 1
 
-    draw.text((x, y), timestamp, font=font, fill=(255, 255, 255))
+    blit_max(frame, timestamp_strip(), y, x)
+
+# Multipart framing for the MJPEG stream; Content-Length lets clients
+# read exactly one JPEG without scanning for the boundary.
+FRAME_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+FRAME_TRAILER = b'\r\n'
 
 async def generate_frames():
     """Async generator function for streaming frames."""
-    while True:
-        async with frame_lock:
-            if latest_frame is not None:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + latest_frame + b'\r\n')
-        await asyncio.sleep(SLEEP_TIME_SECONDS)
+    global active_clients
+    event = asyncio.Event()
+    subscribers.add(event)
+    # Runs on the event loop only, so the counter needs no lock
+    active_clients += 1
+    clients_connected.set()
+    try:
+        while True:
+            await event.wait()
+            event.clear()
+            # The producer already framed the JPEG, so this is one send
+            # of one shared immutable bytes object per frame.
+            yield latest_frame
+    finally:
+        subscribers.discard(event)
+        active_clients -= 1
+        if active_clients == 0:
+            clients_connected.clear()
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
@@ -175,20 +526,34 @@ async def stream():
     return StreamingResponse(generate_frames(), media_type='multipart/x-mixed-replace; boundary=frame')
 
 def start_frame_task_once():
-    """Start the frame-updater async task if not already running."""
-    global frame_task
-    # Make sure we only start the task once
-    if frame_task is None or frame_task.done():
-        logging.info("Starting frame_updater async task.")
-        loop = asyncio.get_event_loop()
-        frame_task = loop.create_task(frame_updater())
+    """Start the frame pipeline (worker threads or hardware encoder) once."""
+    global worker_threads, main_loop
+    # get_running_loop: we're called from the startup hook, so this is
+    # guaranteed to be uvicorn's loop (get_event_loop is deprecated and
+    # could silently create a fresh, never-running loop).
+    main_loop = asyncio.get_running_loop()
+
+    if USE_HW_ENCODER:
+        start_hw_encoder_once()
+        return
+
+    # Make sure we only start the threads once
+    if worker_threads and any(t.is_alive() for t in worker_threads):
+        return
+    logging.info("Starting capture and encode worker threads.")
+    worker_threads = [
+        threading.Thread(target=capture_worker, name="capture", daemon=True),
+        threading.Thread(target=encode_worker, name="encode", daemon=True),
+    ]
+    for thread in worker_threads:
+        thread.start()
 
 @app.on_event("startup")
 async def initialize_on_first_request():
     """
     Lazy initialization hook:
     This will run once per worker process (on the first request),
-    ensuring the camera task is started in the *worker*, not the master.
+    ensuring the camera threads are started in the *worker*, not the master.
     """
     start_frame_task_once()
 